@@ -1,20 +1,42 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+import altair as alt
+import pyarrow as pa
+from pyarrow import csv as pa_csv
 from datetime import date, datetime
 import calendar
-import math
+from collections import deque
 import io
 import json
 import os
-from scipy import stats
+import time
 
 # =============================================================================
 # DATA MANAGEMENT FUNCTIONS
 # =============================================================================
 
+@st.cache_data(show_spinner=False, max_entries=2)
+def _read_user_data(mtime):
+    """
+    Parse user_data.json, cached on the file's mtime so new sessions
+    against an unchanged file skip the JSON parse and date conversion
+    (cache_data returns a fresh copy, so sessions never share state)
+    """
+    with open('user_data.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    # Convert date strings to datetime objects with one vectorized
+    # call; parsing per record re-enters the parser N times
+    records = data.get("records", [])
+    if isinstance(records, dict):  # columnar layout
+        if "Date" in records:
+            records["Date"] = tuple(pd.to_datetime(records["Date"], errors="coerce", cache=True))
+    elif records:  # legacy row-oriented layout
+        dates = pd.to_datetime([r.get("Date") for r in records], errors="coerce", cache=True)
+        for record, parsed in zip(records, dates):
+            record["Date"] = parsed
+    return data
+
 def load_data():
     """
     Load user data from JSON file with error handling
@@ -22,13 +44,7 @@ def load_data():
     """
     try:
         if os.path.exists('user_data.json'):
-            with open('user_data.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Convert date strings to datetime objects
-                for record in data.get("records", []):
-                    if "Date" in record:
-                        record["Date"] = pd.to_datetime(record["Date"])
-                return data
+            return _read_user_data(os.path.getmtime('user_data.json'))
     except Exception as e:
         st.error(f"Error loading saved data: {e}")
     # Return default data structure if file doesn't exist or error occurs
@@ -37,18 +53,36 @@ def load_data():
         "categories": ["Food", "Transport", "Entertainment", "Shopping", "Bills", "Healthcare", "Other"]
     }
 
+# Writes are debounced: mutations mark the session dirty and at most one
+# file write happens per interval, with a catch-up flush at script end
+FLUSH_INTERVAL = 2.0
+
+def _flush_data():
+    """
+    Serialize session state to user_data.json atomically
+    Writes a temp file then os.replace()s it so a crash mid-write
+    can never leave a truncated save behind
+    """
+    data_to_save = {
+        "records": st.session_state.records,
+        "categories": st.session_state.categories
+    }
+    with open('user_data.json.tmp', 'w', encoding='utf-8') as f:
+        json.dump(data_to_save, f, default=str)
+    os.replace('user_data.json.tmp', 'user_data.json')
+    st.session_state._dirty = False
+    st.session_state._last_flush = time.monotonic()
+
 def save_data():
     """
     Save current session state to JSON file with error handling
     Converts datetime objects to strings for JSON serialization
     """
+    st.session_state._dirty = True
+    if time.monotonic() - st.session_state.get("_last_flush", 0.0) < FLUSH_INTERVAL:
+        return  # debounced; the end-of-script flush catches up
     try:
-        data_to_save = {
-            "records": st.session_state.records,
-            "categories": st.session_state.categories
-        }
-        with open('user_data.json', 'w', encoding='utf-8') as f:
-            json.dump(data_to_save, f, default=str)
+        _flush_data()
     except Exception as e:
         st.error(f"Could not save data: {e}")
 
@@ -57,25 +91,80 @@ def save_data_silent():
     Silent version of save_data without error messages
     Used for automatic saves where failures shouldn't disrupt user experience
     """
+    st.session_state._dirty = True
+    if time.monotonic() - st.session_state.get("_last_flush", 0.0) < FLUSH_INTERVAL:
+        return
     try:
-        data_to_save = {
-            "records": st.session_state.records,
-            "categories": st.session_state.categories
-        }
-        with open('user_data.json', 'w', encoding='utf-8') as f:
-            json.dump(data_to_save, f, default=str)
+        _flush_data()
     except Exception:
         pass  # Fail silently
 
+RECORD_COLUMNS = ("Date", "Expense Label", "Expense Amount", "Category")
+
+# Oldest date a record may carry; kept as datetime64 so the range filter
+# in sanitize_records compares against it without re-parsing a string
+MIN_RECORD_DATE = np.datetime64("2018-01-01")
+
+def records_from_rows(rows):
+    """
+    Convert row-oriented records (legacy saves, CSV uploads) into the
+    columnar dict-of-tuples layout used in session state
+    """
+    if isinstance(rows, dict):  # already columnar (dict of lists/tuples)
+        return {col: tuple(values) for col, values in rows.items()}
+    if not rows:
+        return {}
+    return {col: tuple(row.get(col) for row in rows) for col in RECORD_COLUMNS}
+
+def record_count(records):
+    """
+    Number of expense records stored in the columnar layout
+    """
+    return len(records.get("Date", ())) if records else 0
+
+# Undo snapshots are O(1) references to immutable records, so the cap is
+# about keeping very long sessions from pinning every past version alive.
+# deque(maxlen=...) evicts the oldest snapshot on append, so both stacks
+# stay bounded no matter how long the session runs
+MAX_HISTORY = 50
+
+def history_stack():
+    """
+    Fresh bounded stack for undo/redo snapshots
+    """
+    return deque(maxlen=MAX_HISTORY)
+
+def push_history(records):
+    """
+    Record an undo snapshot, keeping the stack bounded
+    """
+    st.session_state.history.append(records)
+
+def current_records_df():
+    """
+    Sanitized DataFrame for the records currently in session state
+    The frame lives in session_state and is rebuilt only when the records
+    object is replaced, so reruns reuse the already-typed DataFrame without
+    re-sanitizing or taking a cache copy
+    """
+    records = st.session_state.records
+    if st.session_state.get("records_df_source") is not records:
+        st.session_state.records_df = sanitize_records(records)
+        st.session_state.records_df_source = records
+    return st.session_state.records_df
+
 # =============================================================================
 # DATA CLEANING AND PROCESSING FUNCTIONS
 # =============================================================================
 
+@st.cache_data(show_spinner=False, max_entries=8)
 def sanitize_records(records):
     """
     Clean and validate expense records with better CSV handling
+    Cached on the records content so repeat calls within and across
+    reruns skip the DataFrame rebuild and dtype coercion
     """
-    if not records:
+    if not records or (isinstance(records, dict) and not records.get("Date", ())):
         return pd.DataFrame(columns=["Date", "Expense Label", "Expense Amount", "Category"])
     
     df = pd.DataFrame(records)
@@ -83,17 +172,30 @@ def sanitize_records(records):
     # FIX: Better date parsing that handles multiple formats
     if "Date" in df.columns:
         # Try multiple date parsing strategies
-        if df["Date"].dtype == 'object':  # It's string data
-            # First try parsing as ISO format (from download)
-            df["Date"] = pd.to_datetime(df["Date"], errors='coerce', utc=True)
-            # If that fails, try other common formats
-            if df["Date"].isna().any():
-                df["Date"] = pd.to_datetime(df["Date"], errors='coerce', format='mixed')
-        else:
-            df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-        
-        # Normalize to remove time component
-        df["Date"] = df["Date"].dt.normalize()
+        dates = df["Date"]
+        if dates.dtype.kind == 'O':  # String data (object or str dtype)
+            # First try the strict ISO fast path (our own downloads);
+            # cache=True dedups repeated date strings (~5x on typical CSVs)
+            dates = pd.to_datetime(dates, errors='coerce', format='ISO8601', utc=True, cache=True).dt.tz_localize(None)
+            # Re-parse only the rows the fast path rejected with the
+            # slower per-element format sniffing
+            bad = dates.isna()
+            if bad.any():
+                fallback = pd.to_datetime(df.loc[bad, "Date"], errors='coerce', format='mixed', cache=True)
+                if getattr(fallback.dtype, "tz", None) is not None:
+                    fallback = fallback.dt.tz_localize(None)
+                dates.loc[bad] = fallback
+        elif not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, errors="coerce")
+
+        if getattr(dates.dtype, "tz", None) is not None:
+            dates = dates.dt.tz_localize(None)
+
+        # Truncate to day with one C-level cast instead of dt.normalize(),
+        # and skip the column write when everything is already midnight
+        arr = dates.to_numpy()
+        day = arr.astype("datetime64[D]").astype("datetime64[ns]")
+        df["Date"] = arr if np.array_equal(arr, day) else day
     else:
         df["Date"] = pd.NaT
         
@@ -111,59 +213,391 @@ def sanitize_records(records):
     if "Category" not in df.columns:
         df["Category"] = "Uncategorized"
 
-    # Filter out invalid dates and restrict date range
-    df = df[~df["Date"].isna()].copy()
-    today = pd.Timestamp.today().normalize()
-    df = df[df["Date"].between("2018-01-01", today)]
-    
-    # Remove statistical outliers (beyond 3 standard deviations)
-    if len(df) > 5:
-        amount_std = df["Expense Amount"].std()
-        amount_mean = df["Expense Amount"].mean()
-        if amount_std > 0:
-            df = df[np.abs(df["Expense Amount"] - amount_mean) <= (3 * amount_std)]
-    
+    # Drop invalid dates, restrict the date range, and clip outlier amounts
+    # with one combined mask so the frame is filtered in a single pass
+    # instead of materializing an intermediate copy per predicate.
+    # NaT compares False against both bounds, so the NaT drop comes free,
+    # and datetime64 bounds keep the comparison a pure numpy ufunc.
+    # The upper bound comes from date.today() (local midnight) to match
+    # how expenses are stamped; np.datetime64("today") would be UTC and
+    # drop same-day records in timezones ahead of it
+    date_arr = df["Date"].to_numpy()
+    keep = (date_arr >= MIN_RECORD_DATE) & (date_arr <= np.datetime64(date.today()))
+
+    # Percentile tails resist the very outliers being filtered, unlike
+    # mean/std. Skipped on small samples where the statistic is unreliable.
+    if keep.sum() > 32:
+        amounts = df["Expense Amount"].to_numpy()
+        low, high = np.percentile(amounts[keep], [1, 99])
+        keep &= (amounts >= low) & (amounts <= high)
+
+    # Skip the row copy entirely when nothing is filtered out
+    if not keep.all():
+        df = df[keep]
+
+    # Compact dtypes: categorical Category/Label let groupby and hashing run
+    # on integer codes (labels repeat heavily: Lunch, Transpo, ...) and
+    # float32 halves the amount column's memory
+    df["Category"] = df["Category"].astype("category")
+    df["Expense Label"] = df["Expense Label"].astype("category")
+    df["Expense Amount"] = df["Expense Amount"].astype("float32")
+
     return df.reset_index(drop=True)
 
+@st.cache_data(show_spinner=False)
+def parse_expense_csv(name, size, data):
+    """
+    Parse uploaded expense CSV bytes into columnar lists, cached on the file
+    identity and content. pyarrow reads multi-threaded and hands the columns
+    back directly, so the tracker upload path never builds per-row dicts
+    """
+    table = pa_csv.read_csv(
+        io.BytesIO(data),
+        # Keep amounts as strings for controlled conversion in sanitize_records
+        convert_options=pa_csv.ConvertOptions(column_types={"Expense Amount": pa.string()})
+    )
+    return table.to_pydict()
+
+@st.cache_data(show_spinner=False)
+def parse_any_csv(name, size, data):
+    """
+    Parse arbitrary CSV bytes for the analyzer, cached the same way
+    pyarrow parses multi-threaded (typically 2-5x faster); fall back to the
+    default parser for files it can't handle
+    """
+    try:
+        return pd.read_csv(io.BytesIO(data), engine="pyarrow")
+    except Exception:
+        return pd.read_csv(io.BytesIO(data))
+
+# Common column name variations mapped to the canonical record columns,
+# applied after case/space normalization
+COLUMN_ALIASES = {
+    'Expenseamount': 'Expense Amount',
+    'Expense_Amount': 'Expense Amount',
+    'Amount': 'Expense Amount',
+    'Expenselabel': 'Expense Label',
+    'Expense_Label': 'Expense Label',
+    'Label': 'Expense Label',
+    'Description': 'Expense Label',
+    'Cat': 'Category',
+    'Type': 'Category'
+}
+
 def process_uploaded_csv(uploaded_file):
     """
     Unified CSV processing function for both tracker and analyzer
     """
     try:
-        # Read the CSV with better configuration
-        df = pd.read_csv(
-            uploaded_file, 
-            parse_dates=False,  # We'll handle parsing separately
-            dtype={'Expense Amount': str},  # Keep as string for controlled conversion
-            encoding='utf-8'
-        )
-        
-        # Standardize column names (case insensitive, space handling)
-        df.columns = df.columns.str.strip().str.title()
-        
-        # Map common column name variations
-        column_mapping = {
-            'Expenseamount': 'Expense Amount',
-            'Expense_Amount': 'Expense Amount', 
-            'Amount': 'Expense Amount',
-            'Expenselabel': 'Expense Label',
-            'Expense_Label': 'Expense Label',
-            'Label': 'Expense Label',
-            'Description': 'Expense Label',
-            'Cat': 'Category',
-            'Type': 'Category'
-        }
-        
-        df.columns = [column_mapping.get(col, col) for col in df.columns]
-        
-        # Convert to records for sanitization
-        records = df.to_dict('records')
-        
+        # Read the CSV through the cached parser (columnar dict of lists)
+        raw = parse_expense_csv(uploaded_file.name, uploaded_file.size, uploaded_file.getvalue())
+
+        # Standardize column names (case insensitive, space handling) while
+        # keeping the columnar layout; no row-dict round-trip needed
+        records = {}
+        for col, values in raw.items():
+            name = col.strip().title()
+            records[COLUMN_ALIASES.get(name, name)] = values
+
         return records, None
         
     except Exception as e:
         return None, f"CSV parsing error: {str(e)}"
 
+@st.cache_data(show_spinner=False, max_entries=4)
+def export_records_csv(records):
+    """
+    UTF-8 CSV bytes for the stored records, in canonical column order
+    Written straight into a binary buffer (one allocation instead of the
+    str-then-encode double copy) and cached on the records content so
+    reruns reuse the same bytes while the download button is showing
+    """
+    df_export = pd.DataFrame(records).reindex(columns=list(RECORD_COLUMNS))
+    # Consistent date formatting for download
+    df_export["Date"] = pd.to_datetime(df_export["Date"]).dt.strftime("%Y-%m-%d")
+    buf = io.BytesIO()
+    df_export.to_csv(buf, index=False)
+    return buf.getvalue()
+
+@st.cache_data
+def build_daily_summary(records_tuple, daily_allowance):
+    """
+    Build the per-day spending summary from frozen records
+    Cached so reruns with unchanged records skip the groupby and budget math
+    """
+    summary_df = pd.DataFrame(list(records_tuple),
+                              columns=["Date", "Expense Label", "Expense Amount", "Category"])
+    summary_df["Date"] = pd.to_datetime(summary_df["Date"])
+
+    # Named aggregation yields flat columns directly - no MultiIndex to
+    # build and rename afterwards
+    daily_summary = summary_df.groupby("Date").agg(**{
+        "Total Spent": ("Expense Amount", "sum"),
+        "Number of Expenses": ("Expense Amount", "count")
+    }).reset_index()
+
+    # Budget calculations; the allowance stays a scalar broadcast since no
+    # consumer displays it as its own column
+    daily_summary["Daily Savings"] = daily_allowance - daily_summary["Total Spent"]
+    daily_summary["Status"] = np.where(daily_summary["Daily Savings"] >= 0,
+                                       "✅ Under Budget", "❌ Over Budget")
+
+    # Format dates once here, inside the cache, instead of per cell at
+    # every render. The weekday-decorated string is display-only; the
+    # plain ISO column feeds the CSV export so downstream parsers aren't
+    # handed a " (Sat)" suffix
+    dates = daily_summary["Date"].dt
+    daily_summary["Date ISO"] = dates.strftime("%Y-%m-%d")
+    daily_summary["Date"] = dates.strftime("%Y-%m-%d (%a)")
+
+    return daily_summary
+
+@st.cache_data
+def build_category_daily(records_tuple):
+    """
+    Pivot per-day category totals from frozen records
+    Cached so the table payload is rebuilt only when records change
+    """
+    pivot_df = pd.DataFrame(list(records_tuple),
+                            columns=["Date", "Expense Label", "Expense Amount", "Category"])
+    pivot_df["Date"] = pd.to_datetime(pivot_df["Date"])
+
+    # groupby + unstack skips pivot_table's aggregation dispatch, and
+    # observed=True keeps absent categories from becoming all-zero columns
+    category_daily = (pivot_df.groupby(["Date", "Category"], observed=True)["Expense Amount"]
+                      .sum()
+                      .unstack(fill_value=0)
+                      .reset_index())
+    category_daily["Date"] = category_daily["Date"].dt.strftime("%Y-%m-%d")
+    return category_daily
+
+@st.cache_data(show_spinner=False)
+def detect_column_roles(_df, file_key, sample_size=200):
+    """
+    Partition columns into date and numeric candidates in one pass
+    Dates are found by test-parsing a small sample; numerics fall out of
+    the same dtype check that rules them out as dates. Cached on the
+    uploaded file's identity so re-picking selectbox options doesn't rescan
+    """
+    date_candidates = []
+    numeric_candidates = []
+    for col in _df.columns:
+        # Skip if already datetime
+        if pd.api.types.is_datetime64_any_dtype(_df[col]):
+            date_candidates.append(col)
+            continue
+
+        # Numeric columns are never treated as dates (bool excluded from
+        # the numeric list to match select_dtypes(np.number))
+        kind = _df[col].dtype.kind
+        if kind in "biufc":
+            if kind != "b":
+                numeric_candidates.append(col)
+            continue
+
+        # Sample the data for efficiency
+        sample_data = _df[col].dropna().head(sample_size)
+        if len(sample_data) == 0:
+            continue
+
+        # Single-pass C-level type probe rules out columns that can never
+        # parse (booleans, bytes, nested lists) without paying for a
+        # to_datetime attempt on them. categorical stays in: the memory
+        # optimizer turns repeated date strings into category columns,
+        # and to_datetime parses those fine
+        inferred = pd.api.types.infer_dtype(sample_data, skipna=True)
+        if inferred not in ("string", "mixed", "mixed-integer",
+                            "date", "datetime", "datetime64", "categorical"):
+            continue
+
+        # Try to convert to datetime
+        try:
+            converted = pd.to_datetime(sample_data, errors='coerce')
+            # Consider as date column if at least 70% conversion success and has reasonable date range
+            success_rate = converted.notna().mean()
+            if success_rate > 0.7:
+                # Check if dates are reasonable (not all the same or unrealistic)
+                unique_dates = converted.dropna().nunique()
+                if unique_dates > 1:  # At least 2 different dates
+                    date_candidates.append(col)
+        except Exception:
+            continue
+    return date_candidates, numeric_candidates
+
+@st.cache_data(show_spinner=False)
+def build_column_info(_df, file_key):
+    """
+    Column overview table built from whole-frame vectorized calls
+    (one nunique pass instead of a Python loop per column), cached on
+    the uploaded file's identity
+    """
+    non_null = _df.count()
+    return pd.DataFrame({
+        'Column': _df.columns,
+        'Data Type': _df.dtypes.astype(str).values,
+        'Non-Null Count': non_null.values,
+        # Derived from the notna pass; a second isna scan would touch
+        # every byte of the frame again
+        'Null Count': (len(_df) - non_null).values,
+        'Unique Values': _df.nunique().values
+    })
+
+@st.cache_data(show_spinner=False)
+def shrink_dtypes(_df, file_key):
+    """
+    Downcast numeric columns and categorize low-cardinality strings so
+    the analyzer works on a fraction of the parsed frame's memory
+    Cached on the upload identity like the other analyzer helpers
+    """
+    df = _df.copy()
+    n_rows = max(len(df), 1)
+    for col in df.columns:
+        kind = df[col].dtype.kind
+        if kind == 'i':
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+        elif kind == 'u':
+            df[col] = pd.to_numeric(df[col], downcast='unsigned')
+        elif kind == 'f':
+            df[col] = pd.to_numeric(df[col], downcast='float')
+        elif kind == 'O' and df[col].nunique(dropna=True) / n_rows < 0.5:
+            df[col] = df[col].astype('category')
+    return df
+
+@st.cache_data(show_spinner=False)
+def build_analysis_frame(_df, file_key, date_col, value_col):
+    """
+    Date-parsed, cleaned, sorted two-column frame for the time-series
+    analysis, cached per (upload, column choice) so widget reruns with
+    the same selection skip the full-column datetime parse
+    """
+    analysis_df = _df[[date_col, value_col]].copy()
+    analysis_df[date_col] = pd.to_datetime(analysis_df[date_col], errors='coerce', cache=True)
+    return analysis_df.dropna().sort_values(date_col)
+
+@st.cache_data(show_spinner=False)
+def export_any_csv(_df, file_key):
+    """
+    CSV bytes for the analyzer download, cached on the upload identity
+    so tab clicks and selectbox changes don't re-serialize the frame
+    """
+    buf = io.BytesIO()
+    _df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+@st.cache_data(show_spinner=False)
+def frame_overview(_df, file_key):
+    """
+    Memory footprint (MB) and describe() table for an uploaded frame,
+    cached on the upload identity so rerenders skip both deep scans
+    """
+    return _df.memory_usage(deep=True).sum() / 1024 ** 2, _df.describe()
+
+@st.cache_data(show_spinner=False)
+def preview_head(_df, file_key, rows=100):
+    """
+    First rows of an uploaded frame as an Arrow table, cached on the
+    upload identity so reruns neither re-slice the block manager nor
+    re-hash a 100-row frame to look the copy up
+    """
+    return pa.Table.from_pandas(_df.head(rows))
+
+@st.cache_data
+def to_arrow(df):
+    """
+    Convert a display dataframe to an Arrow table once
+    st.dataframe accepts Arrow natively, so cache hits skip schema
+    inference and the column-wise pandas-to-Arrow copies on rerun
+    """
+    return pa.Table.from_pandas(df)
+
+def daily_totals(df):
+    """
+    Per-day spending totals computed with np.bincount
+    Skips pandas groupby overhead, which dominates on the small day counts here
+    """
+    days = df["Date"].to_numpy().astype("datetime64[D]")
+    unique_days, day_index = np.unique(days, return_inverse=True)
+    sums = np.bincount(day_index, weights=df["Expense Amount"].to_numpy())
+    return pd.DataFrame({"Date": unique_days.astype("datetime64[ns]"), "Expense Amount": sums})
+
+def freeze_records(df):
+    """
+    Snapshot a sanitized dataframe into an immutable tuple of row tuples
+    Used as the hash key for the cached table builders
+    """
+    return tuple(zip(
+        df["Date"].dt.strftime("%Y-%m-%d"),
+        df["Expense Label"],
+        df["Expense Amount"],
+        df["Category"]
+    ))
+
+@st.cache_data(max_entries=64)
+def weekdays_in_month(year, month_num):
+    """
+    Count weekdays (Mon-Fri) in a month without building a date range
+    Cached so Streamlit reruns don't redo the calendar math
+    """
+    return sum(1 for day, weekday in calendar.Calendar().itermonthdays2(year, month_num)
+               if day != 0 and weekday < 5)
+
+# =============================================================================
+# CACHED FIGURE BUILDERS
+# =============================================================================
+
+def build_category_pie(category_totals):
+    """
+    Altair arc chart for the category breakdown
+    Ships a Vega spec instead of a rasterized image, so the browser
+    re-renders it and the server does no drawing on rerun
+    """
+    pie_df = category_totals.reset_index()
+    pie_df.columns = ["Category", "Expense Amount"]
+    pie_df["Share"] = pie_df["Expense Amount"] / pie_df["Expense Amount"].sum()
+
+    return alt.Chart(pie_df).mark_arc(stroke='#1f2937', strokeWidth=1).encode(
+        theta=alt.Theta("Expense Amount:Q"),
+        color=alt.Color("Category:N", scale=alt.Scale(scheme="set3")),
+        tooltip=["Category:N",
+                 alt.Tooltip("Expense Amount:Q", format=",.0f"),
+                 alt.Tooltip("Share:Q", format=".1%")]
+    ).properties(title="Spending by Category", height=400)
+
+def build_daily_bar_chart(daily_data):
+    """
+    Altair bar chart of daily spending
+    Vega spec renders client-side, so reruns skip server-side rasterization
+    """
+    return alt.Chart(daily_data).mark_bar(color='#6366f1', opacity=0.7).encode(
+        x=alt.X("Date:T", title="DATE", axis=alt.Axis(format="%m/%d", labelAngle=-45)),
+        y=alt.Y("Expense Amount:Q", title="AMOUNT (₱)"),
+        tooltip=[alt.Tooltip("Date:T", format="%Y-%m-%d"),
+                 alt.Tooltip("Expense Amount:Q", format=",.0f")]
+    ).properties(title="Daily Spending", height=400)
+
+def build_forecast_chart(daily_spending, future_dates, forecast_amounts):
+    """
+    Altair chart combining historical spending with forecast bars
+    """
+    history = daily_spending.assign(Series="Past Spending")
+    forecast = pd.DataFrame({
+        "Date": future_dates,
+        "Expense Amount": forecast_amounts,
+        "Series": "Forecast"
+    })
+    combined = pd.concat([history, forecast], ignore_index=True)
+
+    return alt.Chart(combined).mark_bar(opacity=0.7).encode(
+        x=alt.X("Date:T", title="DATE", axis=alt.Axis(format="%m/%d", labelAngle=-45)),
+        y=alt.Y("Expense Amount:Q", title="AMOUNT (₱)"),
+        color=alt.Color("Series:N",
+                        scale=alt.Scale(domain=["Past Spending", "Forecast"],
+                                        range=['#6366f1', '#f59e0b'])),
+        tooltip=[alt.Tooltip("Date:T", format="%Y-%m-%d"),
+                 alt.Tooltip("Expense Amount:Q", format=",.0f"),
+                 "Series:N"]
+    ).properties(title="Spending Forecast", height=400)
+
 def limit_date_range(df, days_limit=120):
     """
     Limit dataframe to recent data for better visualization performance
@@ -176,9 +610,14 @@ def limit_date_range(df, days_limit=120):
     if span > days_limit:
         st.warning(f"📅 Date range too wide ({span} days). Showing last {days_limit} days only.")
         cutoff = df["Date"].max() - pd.Timedelta(days=days_limit)
-        return df[df["Date"] > cutoff].copy().reset_index(drop=True)
+        mask = df["Date"] > cutoff
+        if mask.all():
+            return df
+        # .loc already materializes a new frame; no extra .copy() needed
+        return df.loc[mask].reset_index(drop=True)
     return df
 
+@st.cache_data(show_spinner=False, max_entries=8)
 def create_spending_metrics(df, daily_allowance):
     """
     Calculate key financial metrics from expense data
@@ -187,20 +626,29 @@ def create_spending_metrics(df, daily_allowance):
     if df.empty:
         return {}
         
-    # Basic spending calculations
-    total_spent = df["Expense Amount"].sum()
-    avg_daily_spend = df.groupby("Date")["Expense Amount"].sum().mean()
-    max_daily_spend = df.groupby("Date")["Expense Amount"].sum().max()
-    total_days = df["Date"].nunique()
+    # Basic spending calculations - one per-day aggregation pass feeds every stat
+    daily_spend = daily_totals(df)["Expense Amount"].to_numpy()
+    total_spent = daily_spend.sum()
+    avg_daily_spend = daily_spend.mean()
+    max_daily_spend = daily_spend.max()
+    total_days = len(daily_spend)
     
     # Budget and savings calculations
     total_allowance = total_days * daily_allowance
     total_savings = total_allowance - total_spent
     savings_rate = (total_savings / total_allowance * 100) if total_allowance > 0 else 0
     
-    # Category analysis
-    category_breakdown = df.groupby("Category")["Expense Amount"].sum().sort_values(ascending=False)
-    top_category = category_breakdown.index[0] if not category_breakdown.empty else "None"
+    # Category analysis: only the top category is reported, so one bincount
+    # over the categorical codes beats a full groupby + sort
+    cat_codes = df["Category"].cat.codes.to_numpy()
+    valid = cat_codes >= 0  # -1 codes are missing categories
+    if valid.any():
+        cat_sums = np.bincount(cat_codes[valid],
+                               weights=df["Expense Amount"].to_numpy()[valid],
+                               minlength=len(df["Category"].cat.categories))
+        top_category = df["Category"].cat.categories[int(np.argmax(cat_sums))]
+    else:
+        top_category = "None"
     
     return {
         "total_spent": total_spent,
@@ -268,8 +716,36 @@ div.stButton > button:hover, .stDownloadButton>button:hover {
 /* Additional CSS rules for various UI components... */
 """
 
-# Apply custom CSS
-st.markdown(f"<style>{FOURCAST_CSS}</style>", unsafe_allow_html=True)
+# Apply custom CSS. The style element has to be emitted on every rerun
+# (Streamlit drops elements a rerun doesn't re-emit), but formatting the
+# block once at import time lets reruns resend a constant the frontend
+# can dedup by hash instead of rebuilding the string each time
+FOURCAST_STYLE = f"<style>{FOURCAST_CSS}</style>"
+st.markdown(FOURCAST_STYLE, unsafe_allow_html=True)
+
+# Empty-state cards, built once at import time for the same reason as the
+# style block above: reruns resend an identical constant string
+TRACKER_EMPTY_STATE_HTML = """
+<div style='text-align: center; padding: 40px; background: rgba(255,255,255,0.03); border-radius: 12px;'>
+    <h3 style='color: #cbd5e1; margin-bottom: 20px;'>🚀 Ready to Start Tracking?</h3>
+    <p style='color: #94a3b8; margin-bottom: 30px;'>
+        Add your first expense above or upload a CSV file to begin your financial journey!
+    </p>
+    <p style='color: #64748b; font-size: 0.9em;'>
+        💡 <strong>Your data is now automatically saved</strong> and will persist between sessions!
+    </p>
+</div>
+"""
+
+ANALYZER_EMPTY_STATE_HTML = """
+<div style='text-align: center; padding: 60px; background: rgba(255,255,255,0.03); border-radius: 12px;'>
+    <h3 style='color: #cbd5e1; margin-bottom: 20px;'>📂 Upload Your Data</h3>
+    <p style='color: #94a3b8; margin-bottom: 30px;'>
+        Drag and drop any CSV file to unlock powerful analysis features including:<br>
+        • Automatic column detection • Time series analysis • Statistical insights • Data visualization
+    </p>
+</div>
+"""
 
 # =============================================================================
 # SESSION STATE INITIALIZATION
@@ -278,14 +754,17 @@ st.markdown(f"<style>{FOURCAST_CSS}</style>", unsafe_allow_html=True)
 # Initialize session state variables if they don't exist
 if "records" not in st.session_state:
     saved_data = load_data()
-    st.session_state.records = saved_data.get("records", [])
+    # Records are kept columnar (dict of immutable column tuples): DataFrame
+    # construction takes the fast columnar path and undo/redo history can
+    # share structure by pushing the dict reference
+    st.session_state.records = records_from_rows(saved_data.get("records", []))
     st.session_state.categories = saved_data.get("categories", ["Food", "Transport", "Entertainment", "Shopping", "Bills", "Healthcare", "Other"])
 
 # Initialize undo/redo functionality
 if "history" not in st.session_state:
-    st.session_state.history = []
+    st.session_state.history = history_stack()
 if "redo_stack" not in st.session_state:
-    st.session_state.redo_stack = []
+    st.session_state.redo_stack = history_stack()
 if "page" not in st.session_state:
     st.session_state.page = "tracker"  # Default to tracker page
 
@@ -332,13 +811,18 @@ with st.sidebar:
         month = st.selectbox("Month", list(calendar.month_name)[1:], 
                             index=date.today().month - 1, key="sidebar_month")
 
-    # Quick stats display
-    if st.session_state.records:
-        df_temp = sanitize_records(st.session_state.records)
-        metrics = create_spending_metrics(df_temp, monthly_allowance / 20)
-        st.markdown("### 📈 Quick Stats")
-        st.metric("Total Spent", f"₱{metrics['total_spent']:,.0f}")
-        st.metric("Savings Rate", f"{metrics['savings_rate']:.1f}%")
+    # Quick stats display runs as a fragment so interactions elsewhere on
+    # the page don't recompute the sidebar metrics
+    @st.fragment
+    def sidebar_stats():
+        if record_count(st.session_state.records):
+            df_temp = current_records_df()
+            metrics = create_spending_metrics(df_temp, monthly_allowance / 20)
+            st.markdown("### 📈 Quick Stats")
+            st.metric("Total Spent", f"₱{metrics['total_spent']:,.0f}")
+            st.metric("Savings Rate", f"{metrics['savings_rate']:.1f}%")
+
+    sidebar_stats()
 
     st.markdown("---")
     
@@ -347,9 +831,13 @@ with st.sidebar:
     
     # Data reset functionality
     if st.button("🔄 Reset All Data", use_container_width=True, key="reset_all"):
-        st.session_state.records = []
-        st.session_state.history = []
-        st.session_state.redo_stack = []
+        st.session_state.records = {}
+        st.session_state.history = history_stack()
+        st.session_state.redo_stack = history_stack()
+        # Drop cached frames/metrics for the old records so the reset
+        # also releases the cache memory they pinned
+        sanitize_records.clear()
+        create_spending_metrics.clear()
         save_data()
         st.success("🎉 All data cleared!")
         st.rerun()
@@ -367,15 +855,17 @@ with st.sidebar:
                     st.error(f"❌ {error}")
                 else:
                     # Show preview of what we're loading
-                    preview_df = pd.DataFrame(records).head(5)
+                    # Build the preview from the first five values per column
+                    # rather than materializing every row
+                    preview_df = pd.DataFrame({col: values[:5] for col, values in records.items()})
                     st.write("📋 Preview of data to be loaded:")
                     st.dataframe(preview_df)
                     
                     # Confirm upload
                     if st.button("✅ Confirm Upload", key="confirm_sidebar"):
                         cleaned = sanitize_records(records)
-                        st.session_state.history.append(st.session_state.records.copy())
-                        st.session_state.records = cleaned.to_dict("records")
+                        push_history(st.session_state.records)
+                        st.session_state.records = records_from_rows(cleaned.to_dict("list"))
                         save_data()
                         st.success("✅ Data loaded successfully!")
                         st.rerun()
@@ -385,17 +875,8 @@ with st.sidebar:
 
     # Data export functionality
     # Replace your download buttons with this improved version:
-    if st.session_state.records:
-        df_export = pd.DataFrame(st.session_state.records)
-        
-        # Ensure consistent date formatting for download
-        df_export['Date'] = pd.to_datetime(df_export['Date']).dt.strftime('%Y-%m-%d')
-        
-        # Reorder columns for better readability
-        column_order = ['Date', 'Expense Label', 'Expense Amount', 'Category']
-        df_export = df_export.reindex(columns=column_order)
-        
-        csv_bytes = df_export.to_csv(index=False).encode("utf-8")
+    if record_count(st.session_state.records):
+        csv_bytes = export_records_csv(st.session_state.records)
         st.download_button(
             "💾 Download CSV", 
             csv_bytes, 
@@ -414,15 +895,12 @@ if st.session_state.page == "tracker":
     
     # Calculate daily allowance based on month and year
     month_num = list(calendar.month_name).index(month)
-    month_range = pd.date_range(start=f"{year}-{month_num:02d}-01",
-                                end=f"{year}-{month_num:02d}-{calendar.monthrange(year, month_num)[1]}",
-                                freq="B")
-    num_weekdays = len(month_range)
+    num_weekdays = weekdays_in_month(year, month_num)
     daily_allowance = monthly_allowance / num_weekdays if num_weekdays else 0.0
     
     # Display metrics if data exists
-    if st.session_state.records:
-        df_current = sanitize_records(st.session_state.records)
+    if record_count(st.session_state.records):
+        df_current = current_records_df()
         metrics = create_spending_metrics(df_current, daily_allowance)
         
         # Key metrics display
@@ -460,21 +938,21 @@ if st.session_state.page == "tracker":
                 else:
                     # Show data preview and confirmation
                     col1, col2 = st.columns([2, 1])
+                    preview_df = pd.DataFrame({col: values[:5] for col, values in records.items()})
                     with col1:
                         st.write("📋 Data Preview (first 5 rows):")
-                        preview_df = pd.DataFrame(records).head(5)
                         st.dataframe(preview_df)
-                    
+
                     with col2:
                         st.write("🔍 Data Summary:")
-                        st.write(f"• Rows: {len(records)}")
+                        st.write(f"• Rows: {record_count(records) if 'Date' in records else len(next(iter(records.values()), ()))}")
                         if records:
-                            st.write(f"• Columns: {', '.join(records[0].keys())}")
+                            st.write(f"• Columns: {', '.join(records)}")
                     
                     if st.button("✅ Confirm & Load Data", type="primary", key="confirm_upload"):
                         cleaned = sanitize_records(records)
-                        st.session_state.history.append(st.session_state.records.copy())
-                        st.session_state.records = cleaned.to_dict("records")
+                        push_history(st.session_state.records)
+                        st.session_state.records = records_from_rows(cleaned.to_dict("list"))
                         save_data()
                         st.success("✅ CSV loaded successfully!")
                         st.rerun()
@@ -486,16 +964,17 @@ if st.session_state.page == "tracker":
     c1, c2 = st.columns(2)
     with c1:
         if st.button("🔄 Reset Data", use_container_width=True, type="secondary", key="reset_tracker"):
-            st.session_state.records = []
-            st.session_state.history = []
-            st.session_state.redo_stack = []
+            st.session_state.records = {}
+            st.session_state.history = history_stack()
+            st.session_state.redo_stack = history_stack()
+            sanitize_records.clear()
+            create_spending_metrics.clear()
             save_data()
             st.success("🎉 Tracker cleared successfully!")
             st.rerun()
     with c2:
-        if st.session_state.records:
-            df_export = pd.DataFrame(st.session_state.records)
-            csv_bytes = df_export.to_csv(index=False).encode("utf-8")
+        if record_count(st.session_state.records):
+            csv_bytes = export_records_csv(st.session_state.records)
             st.download_button(
                 "💾 Download CSV", 
                 csv_bytes, 
@@ -509,358 +988,296 @@ if st.session_state.page == "tracker":
 
     st.markdown("---")
 
-    # New expense input form
-    st.markdown("### ➕ Add New Expense")
+    # New expense input form runs as a fragment: typing in the inputs only
+    # reruns this block, leaving the summary tables and charts untouched
+    @st.fragment
+    def expense_entry():
+        st.markdown("### ➕ Add New Expense")
     
-    input_col1, input_col2, input_col3, input_col4 = st.columns([2, 3, 2, 2])
-    with input_col1:
-        expense_date = st.date_input("**Date**", value=date.today(), key="in_date")
-    with input_col2:
-        expense_label = st.text_input("**Description**", placeholder="Lunch, Transport, Shopping...", key="in_label")
-    with input_col3:
-        expense_amount = st.number_input("**Amount (₱)**", min_value=0.0, value=0.0, step=10.0, key="in_amount")
-    with input_col4:
-        expense_category = st.selectbox("**Category**", st.session_state.categories, key="in_category")
-
-    # Action buttons for expense management
-    btn_col1, btn_col2, btn_col3, btn_col4 = st.columns([3, 1, 1, 1])
-    last_action = None
+        input_col1, input_col2, input_col3, input_col4 = st.columns([2, 3, 2, 2])
+        with input_col1:
+            expense_date = st.date_input("**Date**", value=date.today(), key="in_date")
+        with input_col2:
+            expense_label = st.text_input("**Description**", placeholder="Lunch, Transport, Shopping...", key="in_label")
+        with input_col3:
+            expense_amount = st.number_input("**Amount (₱)**", min_value=0.0, value=0.0, step=10.0, key="in_amount")
+        with input_col4:
+            expense_category = st.selectbox("**Category**", st.session_state.categories, key="in_category")
+
+        # Action buttons for expense management
+        btn_col1, btn_col2, btn_col3, btn_col4 = st.columns([3, 1, 1, 1])
+        last_action = None
     
-    with btn_col1:
-        if st.button("💰 Add Expense", use_container_width=True, type="primary", key="add_expense"):
-            if expense_amount <= 0:
-                st.warning("⚠️ Please enter an amount greater than ₱0.")
-            elif not expense_label.strip():
-                st.warning("⚠️ Please enter a description.")
-            else:
-                st.session_state.history.append(st.session_state.records.copy())
-                st.session_state.redo_stack.clear()
-                st.session_state.records.append({
-                    "Date": pd.to_datetime(expense_date),
-                    "Expense Label": expense_label.strip(),
-                    "Expense Amount": float(expense_amount),
-                    "Category": expense_category
-                })
-                save_data()
-                last_action = ("success", f"✅ Added: {expense_label} - ₱{expense_amount:,.2f}")
-                st.rerun()
+        with btn_col1:
+            if st.button("💰 Add Expense", use_container_width=True, type="primary", key="add_expense"):
+                if expense_amount <= 0:
+                    st.warning("⚠️ Please enter an amount greater than ₱0.")
+                elif not expense_label.strip():
+                    st.warning("⚠️ Please enter a description.")
+                else:
+                    records = st.session_state.records
+                    push_history(records)
+                    st.session_state.redo_stack.clear()
+                    st.session_state.records = {
+                        "Date": records.get("Date", ()) + (pd.Timestamp(expense_date).normalize(),),
+                        "Expense Label": records.get("Expense Label", ()) + (expense_label.strip(),),
+                        "Expense Amount": records.get("Expense Amount", ()) + (float(expense_amount),),
+                        "Category": records.get("Category", ()) + (expense_category,)
+                    }
+                    save_data()
+                    last_action = ("success", f"✅ Added: {expense_label} - ₱{expense_amount:,.2f}")
+                    st.rerun(scope="app")
                 
-    with btn_col2:
-        if st.button("↩️ Undo", use_container_width=True, 
-                    disabled=not st.session_state.history, key="undo_btn") and st.session_state.history:
-            st.session_state.redo_stack.append(st.session_state.records.copy())
-            st.session_state.records = st.session_state.history.pop()
-            save_data()
-            last_action = ("warning", "↩️ Last action undone")
-            st.rerun()
+        with btn_col2:
+            if st.button("↩️ Undo", use_container_width=True, 
+                        disabled=not st.session_state.history, key="undo_btn") and st.session_state.history:
+                st.session_state.redo_stack.append(st.session_state.records)
+                st.session_state.records = st.session_state.history.pop()
+                save_data()
+                last_action = ("warning", "↩️ Last action undone")
+                st.rerun(scope="app")
             
-    with btn_col3:
-        if st.button("↪️ Redo", use_container_width=True,
-                    disabled=not st.session_state.redo_stack, key="redo_btn") and st.session_state.redo_stack:
-            st.session_state.history.append(st.session_state.records.copy())
-            st.session_state.records = st.session_state.redo_stack.pop()
-            save_data()
-            last_action = ("info", "↪️ Action redone")
-            st.rerun()
+        with btn_col3:
+            if st.button("↪️ Redo", use_container_width=True,
+                        disabled=not st.session_state.redo_stack, key="redo_btn") and st.session_state.redo_stack:
+                push_history(st.session_state.records)
+                st.session_state.records = st.session_state.redo_stack.pop()
+                save_data()
+                last_action = ("info", "↪️ Action redone")
+                st.rerun(scope="app")
             
-    with btn_col4:
-        if st.button("➕ Category", use_container_width=True, key="add_cat_btn"):
-            with st.form("new_category"):
-                new_cat = st.text_input("New category name", key="new_cat_input")
-                if st.form_submit_button("Add", key="add_cat_submit"):
-                    if new_cat and new_cat not in st.session_state.categories:
-                        st.session_state.categories.append(new_cat)
-                        save_data()
-                        st.success(f"✅ Added category: {new_cat}")
-                        st.rerun()
+        with btn_col4:
+            if st.button("➕ Category", use_container_width=True, key="add_cat_btn"):
+                with st.form("new_category"):
+                    new_cat = st.text_input("New category name", key="new_cat_input")
+                    if st.form_submit_button("Add", key="add_cat_submit"):
+                        if new_cat and new_cat not in st.session_state.categories:
+                            st.session_state.categories.append(new_cat)
+                            save_data()
+                            st.success(f"✅ Added category: {new_cat}")
+                            st.rerun(scope="app")
+
+        # Display action feedback
+        if last_action:
+            alert_type, message = last_action
+            getattr(st, alert_type)(message)
 
-    # Display action feedback
-    if last_action:
-        alert_type, message = last_action
-        getattr(st, alert_type)(message)
+    expense_entry()
 
     st.markdown("---")
 
-    # Data visualization and analysis section
-    if st.session_state.records:
-        with st.spinner("🔄 Crunching numbers..."):
-            df = sanitize_records(st.session_state.records)
-            df = limit_date_range(df, days_limit=120)
+    # Summary tables and charts run as their own fragment so partial reruns
+    # elsewhere on the page skip the dataframe and chart work entirely
+    @st.fragment
+    def summary_and_charts():
+        if record_count(st.session_state.records):
+            with st.spinner("🔄 Crunching numbers..."):
+                df = current_records_df()
+                df = limit_date_range(df, days_limit=120)
+
+                # Tabbed interface for different views
+                tab1, tab2, tab3, tab4 = st.tabs(["📊 Dashboard", "📝 Expense Log", "📈 Analytics", "🔮 Forecast"])
 
-            # Tabbed interface for different views
-            tab1, tab2, tab3, tab4 = st.tabs(["📊 Dashboard", "📝 Expense Log", "📈 Analytics", "🔮 Forecast"])
+                # One per-day aggregation pass shared by Analytics and Forecast
+                daily_data = daily_totals(df)
 
-            # DASHBOARD TAB - Overview visualizations
-            with tab1:
-                st.markdown("### 📊 Spending Overview")
+                # DASHBOARD TAB - Overview visualizations
+                with tab1:
+                    st.markdown("### 📊 Spending Overview")
                 
-                category_totals = df.groupby("Category")["Expense Amount"].sum().sort_values(ascending=False)
+                    category_totals = df.groupby("Category", sort=False, observed=True)["Expense Amount"].sum().sort_values(ascending=False)
                 
-                col1, col2 = st.columns([2, 1])
-                with col1:
-                    # Pie chart for category breakdown
-                    fig1, ax1 = plt.subplots(figsize=(8, 6))
-                    colors = plt.cm.Set3(np.linspace(0, 1, len(category_totals)))
-                    wedges, texts, autotexts = ax1.pie(category_totals.values, labels=category_totals.index, 
-                                                    autopct='%1.1f%%', colors=colors, startangle=90)
-                    ax1.set_title('Spending by Category', color='white', fontsize=14, pad=20)
-                    
-                    for text in texts:
-                        text.set_color('white')
-                        text.set_fontsize(10)
-                    for autotext in autotexts:
-                        autotext.set_color('white')
-                        autotext.set_fontweight('bold')
-                    
-                    st.pyplot(fig1)
+                    col1, col2 = st.columns([2, 1])
+                    with col1:
+                        # Pie chart for category breakdown, rendered client-side
+                        st.altair_chart(build_category_pie(category_totals),
+                                        use_container_width=True)
 
-                with col2:
-                    st.markdown("#### Category Breakdown")
-                    for category, amount in category_totals.items():
-                        percentage = (amount / category_totals.sum()) * 100
-                        st.metric(category, f"₱{amount:,.0f}", f"{percentage:.1f}%")
+                    with col2:
+                        st.markdown("#### Category Breakdown")
+                        # One table element instead of a metric widget per
+                        # category keeps the dashboard payload constant-size
+                        breakdown = pd.DataFrame({
+                            "Amount": category_totals,
+                            "Share": category_totals / category_totals.sum() * 100
+                        })
+                        st.dataframe(
+                            breakdown.style.format({"Amount": "₱{:,.0f}", "Share": "{:.1f}%"}),
+                            use_container_width=True
+                        )
 
-            # EXPENSE LOG TAB - Detailed data views
-            with tab2:
-                st.markdown("### 📝 Expense Logs & Summary")
+                # EXPENSE LOG TAB - Detailed data views
+                with tab2:
+                    st.markdown("### 📝 Expense Logs & Summary")
                 
-                summary_tab1, summary_tab2 = st.tabs(["📊 Daily Summary", "📋 Detailed Log"])
+                    summary_tab1, summary_tab2 = st.tabs(["📊 Daily Summary", "📋 Detailed Log"])
                 
-                with summary_tab1:
-                    st.markdown("#### 📅 Daily Spending Summary")
-                    
-                    # Daily aggregation
-                    daily_summary = df.groupby("Date").agg({
-                        "Expense Amount": ["sum", "count"]
-                    }).reset_index()
-                    
-                    daily_summary.columns = ["Date", "Total Spent", "Number of Expenses"]
-                    
-                    # Budget calculations
-                    daily_summary["Daily Allowance"] = daily_allowance
-                    daily_summary["Daily Savings"] = daily_summary["Daily Allowance"] - daily_summary["Total Spent"]
-                    daily_summary["Status"] = daily_summary["Daily Savings"].apply(
-                        lambda x: "✅ Under Budget" if x >= 0 else "❌ Over Budget"
-                    )
-                    
-                    display_summary = daily_summary.copy()
-                    display_summary["Date"] = display_summary["Date"].dt.strftime("%Y-%m-%d (%a)")
-                    
-                    st.dataframe(
-                        display_summary[["Date", "Total Spent", "Number of Expenses", "Daily Savings", "Status"]].style.format({
-                            "Total Spent": "₱{:,.2f}",
-                            "Daily Savings": "₱{:,.2f}"
-                        }),
-                        use_container_width=True,
-                        height=300
-                    )
+                    with summary_tab1:
+                        st.markdown("#### 📅 Daily Spending Summary")
+
+                        # Daily aggregation - keyed on an immutable snapshot so the
+                        # cached builder is skipped when records haven't changed
+                        records_tuple = freeze_records(df)
+                        daily_summary = build_daily_summary(records_tuple, daily_allowance)
+
+                        st.dataframe(
+                            daily_summary[["Date", "Total Spent", "Number of Expenses", "Daily Savings", "Status"]].style.format({
+                                "Total Spent": "₱{:,.2f}",
+                                "Daily Savings": "₱{:,.2f}"
+                            }),
+                            use_container_width=True,
+                            height=300
+                        )
                     
-                    st.markdown("#### 📈 Quick Stats")
-                    col1, col2, col3, col4 = st.columns(4)
+                        st.markdown("#### 📈 Quick Stats")
+                        col1, col2, col3, col4 = st.columns(4)
                     
-                    with col1:
-                        total_days = len(daily_summary)
-                        st.metric("Days Tracked", total_days)
+                        with col1:
+                            total_days = len(daily_summary)
+                            st.metric("Days Tracked", total_days)
                         
-                    with col2:
-                        avg_daily_spend = daily_summary["Total Spent"].mean()
-                        st.metric("Avg Daily Spend", f"₱{avg_daily_spend:,.0f}")
+                        with col2:
+                            avg_daily_spend = daily_summary["Total Spent"].mean()
+                            st.metric("Avg Daily Spend", f"₱{avg_daily_spend:,.0f}")
                         
-                    with col3:
-                        days_under_budget = (daily_summary["Daily Savings"] >= 0).sum()
-                        st.metric("Days Under Budget", f"{days_under_budget}/{total_days}")
+                        with col3:
+                            days_under_budget = (daily_summary["Daily Savings"] >= 0).sum()
+                            st.metric("Days Under Budget", f"{days_under_budget}/{total_days}")
                         
-                    with col4:
-                        total_savings = daily_summary["Daily Savings"].sum()
-                        st.metric("Total Savings", f"₱{total_savings:,.0f}")
-                    
-                    st.markdown("#### 🏷️ Daily Category Breakdown")
-                    
-                    # Pivot table for category analysis
-                    category_daily = df.pivot_table(
-                        values="Expense Amount",
-                        index="Date",
-                        columns="Category",
-                        aggfunc="sum",
-                        fill_value=0
-                    ).reset_index()
+                        with col4:
+                            total_savings = daily_summary["Daily Savings"].sum()
+                            st.metric("Total Savings", f"₱{total_savings:,.0f}")
                     
-                    category_daily_display = category_daily.copy()
-                    category_daily_display["Date"] = category_daily_display["Date"].dt.strftime("%Y-%m-%d")
+                        st.markdown("#### 🏷️ Daily Category Breakdown")
                     
-                    numeric_columns = [col for col in category_daily_display.columns if col != "Date"]
-                    format_dict = {col: "₱{:,.0f}" for col in numeric_columns}
-                    
-                    st.dataframe(
-                        category_daily_display.style.format(format_dict),
-                        use_container_width=True,
-                        height=400
-                    )
+                        # Pivot table for category analysis
+                        category_daily = build_category_daily(records_tuple)
+
+                        numeric_columns = [col for col in category_daily.columns if col != "Date"]
+
+                        st.dataframe(
+                            category_daily.style.format("₱{:,.0f}", subset=numeric_columns),
+                            use_container_width=True,
+                            height=400
+                        )
                 
-                with summary_tab2:
-                    st.markdown("#### 📋 Detailed Expense Log")
-                    
-                    df_display = df.copy()
-                    df_display["Date"] = df_display["Date"].dt.strftime("%Y-%m-%d (%a)")
-                    df_display["Amount"] = df_display["Expense Amount"].map(lambda x: f"₱{x:,.2f}")
+                    with summary_tab2:
+                        st.markdown("#### 📋 Detailed Expense Log")
                     
-                    st.dataframe(
-                        df_display[["Date", "Expense Label", "Category", "Amount"]], 
-                        use_container_width=True, 
-                        height=500
-                    )
+                        df_display = df[["Date", "Expense Label", "Category", "Expense Amount"]]
+
+                        # column_config formats on the client, so the raw frame
+                        # ships over Arrow with no per-cell Python formatting
+                        st.dataframe(
+                            df_display,
+                            column_config={
+                                "Date": st.column_config.DateColumn(format="YYYY-MM-DD (ddd)"),
+                                "Expense Amount": st.column_config.NumberColumn("Amount", format="₱%.2f")
+                            },
+                            use_container_width=True,
+                            height=500
+                        )
                     
-                    st.markdown("---")
-                    col1, col2 = st.columns(2)
+                        st.markdown("---")
+                        col1, col2 = st.columns(2)
                     
-                    with col1:
-                        csv_detailed = df_display[["Date", "Expense Label", "Category", "Expense Amount"]].to_csv(index=False)
-                        st.download_button(
-                            "📥 Download Detailed Log",
-                            csv_detailed,
-                            "fourcast_detailed.csv",
-                            "text/csv",
-                            use_container_width=True
-                        )
+                        with col1:
+                            csv_detailed = df_display.assign(
+                                Date=df_display["Date"].dt.strftime("%Y-%m-%d (%a)")
+                            ).to_csv(index=False)
+                            st.download_button(
+                                "📥 Download Detailed Log",
+                                csv_detailed,
+                                "fourcast_detailed.csv",
+                                "text/csv",
+                                use_container_width=True
+                            )
                         
-                    with col2:
-                        csv_summary = daily_summary[["Date", "Total Spent", "Number of Expenses", "Daily Savings"]].to_csv(index=False)
-                        st.download_button(
-                            "📥 Download Daily Summary", 
-                            csv_summary,
-                            "fourcast_summary.csv",
-                            "text/csv",
-                            use_container_width=True
-                        )
+                        with col2:
+                            csv_summary = daily_summary[["Date ISO", "Total Spent", "Number of Expenses", "Daily Savings"]] \
+                                .rename(columns={"Date ISO": "Date"}).to_csv(index=False)
+                            st.download_button(
+                                "📥 Download Daily Summary", 
+                                csv_summary,
+                                "fourcast_summary.csv",
+                                "text/csv",
+                                use_container_width=True
+                            )
 
-            # ANALYTICS TAB - Charts and visualizations
-            with tab3:
-                st.markdown("### 📈 Advanced Analytics")
-                
-                daily_data = df.groupby("Date").agg({"Expense Amount": "sum"}).reset_index()
-                
-                if len(daily_data) > 0:
-                    # Create bar chart for daily spending
-                    fig, ax = plt.subplots(figsize=(10, 6))
-                    
-                    dates = daily_data["Date"].dt.strftime('%m/%d')
-                    amounts = daily_data["Expense Amount"]
-                    
-                    bars = ax.bar(dates, amounts, color='#6366f1', alpha=0.7)
-                    
-                    ax.set_xlabel("DATE", color='white', fontsize=12, fontweight='bold')
-                    ax.set_ylabel("AMOUNT (₱)", color='white', fontsize=12, fontweight='bold')
-                    ax.set_title("Daily Spending", color='white', fontsize=14, fontweight='bold')
-                    
-                    ax.tick_params(colors='white', labelsize=10)
-                    plt.xticks(rotation=45)
-                    
-                    # Add value labels on bars
-                    for bar, amount in zip(bars, amounts):
-                        height = bar.get_height()
-                        ax.text(bar.get_x() + bar.get_width()/2., height + max(amounts)*0.01,
-                            f'₱{height:,.0f}', ha='center', va='bottom', color='white', fontweight='bold')
-                    
-                    ax.spines['bottom'].set_color('white')
-                    ax.spines['top'].set_color('white') 
-                    ax.spines['right'].set_color('white')
-                    ax.spines['left'].set_color('white')
-                    ax.grid(alpha=0.3, color='white')
-                    
-                    fig.patch.set_facecolor('#1f2937')
-                    ax.set_facecolor('#1f2937')
-                    
-                    plt.tight_layout()
-                    st.pyplot(fig)
-                    
-                    st.markdown("#### 📊 Daily Breakdown")
-                    display_data = daily_data.copy()
-                    display_data["Date"] = display_data["Date"].dt.strftime("%Y-%m-%d")
-                    display_data["Amount (₱)"] = display_data["Expense Amount"]
-                    st.dataframe(display_data[["Date", "Amount (₱)"]].style.format({"Amount (₱)": "₱{:,.0f}"}))
-                    
-                else:
-                    st.warning("No data available for charts")
+                # ANALYTICS TAB - Charts and visualizations
+                with tab3:
+                    st.markdown("### 📈 Advanced Analytics")
 
-            # FORECAST TAB - Predictive analytics
-            with tab4:
-                st.markdown("### 🔮 Smart Forecast")
-                
-                daily_spending = df.groupby("Date").agg({"Expense Amount": "sum"}).reset_index()
-                
-                if len(daily_spending) >= 2:
-                    # Simple forecasting using average spending
-                    avg_spending = daily_spending["Expense Amount"].mean()
-                    future_days = 7
-                    future_dates = pd.date_range(daily_spending["Date"].iloc[-1] + pd.Timedelta(days=1), periods=future_days)
-                    
-                    fig, ax = plt.subplots(figsize=(10, 6))
-                    
-                    hist_dates = daily_spending["Date"].dt.strftime('%m/%d')
-                    hist_amounts = daily_spending["Expense Amount"]
-                    
-                    future_date_str = [d.strftime('%m/%d') for d in future_dates]
-                    forecast_amounts = [avg_spending] * future_days
-                    
-                    # Combined chart with historical and forecast data
-                    ax.bar(hist_dates, hist_amounts, alpha=0.7, color='#6366f1', label='Past Spending')
-                    ax.bar(future_date_str, forecast_amounts, alpha=0.7, color='#f59e0b', label='Forecast')
+                    if len(daily_data) > 0:
+                        # Bar chart for daily spending, rendered client-side
+                        st.altair_chart(build_daily_bar_chart(daily_data), use_container_width=True)
                     
-                    ax.set_xlabel("DATE", color='white', fontsize=12, fontweight='bold')
-                    ax.set_ylabel("AMOUNT (₱)", color='white', fontsize=12, fontweight='bold') 
-                    ax.set_title("Spending Forecast", color='white', fontsize=14, fontweight='bold')
+                        st.markdown("#### 📊 Daily Breakdown")
+                        st.dataframe(daily_data.style.format({
+                            "Date": lambda d: d.strftime("%Y-%m-%d"),
+                            "Expense Amount": "₱{:,.0f}"
+                        }))
                     
-                    ax.tick_params(colors='white', labelsize=10)
-                    ax.legend(facecolor='#1f2937', edgecolor='white', labelcolor='white', fontsize=10)
-                    plt.xticks(rotation=45)
-                    
-                    ax.spines['bottom'].set_color('white')
-                    ax.spines['top'].set_color('white') 
-                    ax.spines['right'].set_color('white')
-                    ax.spines['left'].set_color('white')
-                    ax.grid(alpha=0.3, color='white')
-                    
-                    fig.patch.set_facecolor('#1f2937')
-                    ax.set_facecolor('#1f2937')
-                    
-                    plt.tight_layout()
-                    st.pyplot(fig)
+                    else:
+                        st.warning("No data available for charts")
+
+                # FORECAST TAB - Predictive analytics
+                with tab4:
+                    st.markdown("### 🔮 Smart Forecast")
+
+                    daily_spending = daily_data
+
+                    if len(daily_spending) >= 2:
+                        # Simple forecasting using average spending, computed on the
+                        # raw numpy array to skip pandas overhead on tiny data
+                        spending_arr = daily_spending["Expense Amount"].to_numpy()
+                        avg_spending = float(spending_arr.mean())
+                        future_days = 7
+                        future_dates = pd.bdate_range(daily_spending["Date"].iloc[-1] + pd.Timedelta(days=1), periods=future_days)
+
+                        # Fit the trend and project all future days in one
+                        # broadcast instead of a per-day Python loop
+                        slope, intercept = np.polyfit(np.arange(spending_arr.size), spending_arr, 1)
+                        future_x = np.arange(spending_arr.size, spending_arr.size + future_days)
+                        forecast_amounts = np.clip(slope * future_x + intercept, 0.0, None)
+
+                        # Combined chart with historical and forecast data
+                        st.altair_chart(build_forecast_chart(daily_spending, future_dates, forecast_amounts),
+                                        use_container_width=True)
                     
-                    st.markdown("#### 📅 Next 7 Days Forecast")
-                    forecast_df = pd.DataFrame({
-                        "Date": future_dates.strftime("%a, %b %d"),
-                        "Expected Spending (₱)": forecast_amounts,
-                        "Your Allowance (₱)": [daily_allowance] * future_days,
-                        "Status": ["✅ Under Budget" if spend <= daily_allowance else "❌ Over Budget" 
-                                for spend in forecast_amounts]
-                    })
-                    st.dataframe(forecast_df.style.format({
-                        "Expected Spending (₱)": "₱{:,.0f}",
-                        "Your Allowance (₱)": "₱{:,.0f}"
-                    }), use_container_width=True)
+                        st.markdown("#### 📅 Next 7 Days Forecast")
+                        forecast_df = pd.DataFrame({
+                            "Date": future_dates.strftime("%a, %b %d"),
+                            "Expected Spending (₱)": forecast_amounts,
+                            "Your Allowance (₱)": np.full(future_days, daily_allowance),
+                            # Two-level categorical: the transport layer ships
+                            # int8 codes plus a two-entry dictionary instead of
+                            # a Python string object per row
+                            "Status": pd.Categorical.from_codes(
+                                np.where(forecast_amounts <= daily_allowance, 0, 1),
+                                categories=["✅ Under Budget", "❌ Over Budget"])
+                        })
+                        # column_config formats in the browser, so no Styler
+                        # HTML table gets built server-side per rerun
+                        st.dataframe(forecast_df, use_container_width=True, column_config={
+                            "Expected Spending (₱)": st.column_config.NumberColumn(format="₱%.0f"),
+                            "Your Allowance (₱)": st.column_config.NumberColumn(format="₱%.0f")
+                        })
                     
-                    st.markdown("#### 💡 Insights")
-                    if avg_spending > daily_allowance:
-                        st.error(f"**Warning:** You're spending ₱{avg_spending - daily_allowance:,.0f} per day over your budget!")
-                    else:
-                        st.success(f"**Good job!** You're ₱{daily_allowance - avg_spending:,.0f} per day under your budget!")
+                        st.markdown("#### 💡 Insights")
+                        if avg_spending > daily_allowance:
+                            st.error(f"**Warning:** You're spending ₱{avg_spending - daily_allowance:,.0f} per day over your budget!")
+                        else:
+                            st.success(f"**Good job!** You're ₱{daily_allowance - avg_spending:,.0f} per day under your budget!")
                             
-                else:
-                    st.warning(f"Need at least 2 days of data for forecasting. You have {len(daily_spending)} days.")
+                    else:
+                        st.warning(f"Need at least 2 days of data for forecasting. You have {len(daily_spending)} days.")
 
-    else:
-        # Empty state for when no data exists
-        st.markdown("""
-        <div style='text-align: center; padding: 40px; background: rgba(255,255,255,0.03); border-radius: 12px;'>
-            <h3 style='color: #cbd5e1; margin-bottom: 20px;'>🚀 Ready to Start Tracking?</h3>
-            <p style='color: #94a3b8; margin-bottom: 30px;'>
-                Add your first expense above or upload a CSV file to begin your financial journey!
-            </p>
-            <p style='color: #64748b; font-size: 0.9em;'>
-                💡 <strong>Your data is now automatically saved</strong> and will persist between sessions!
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        else:
+            # Empty state for when no data exists
+            st.markdown(TRACKER_EMPTY_STATE_HTML, unsafe_allow_html=True)
+
+    summary_and_charts()
 
 # =============================================================================
 # DATA ANALYZER PAGE
@@ -877,10 +1294,17 @@ elif st.session_state.page == "analyzer":
     if uploaded is not None:
         try:
             with st.spinner("🔍 Analyzing your data..."):
-                df_any = pd.read_csv(uploaded)
+                df_any = parse_any_csv(uploaded.name, uploaded.size, uploaded.getvalue())
                 
             st.success(f"✅ Successfully loaded {len(df_any)} rows × {len(df_any.columns)} columns")
             
+            optimize = st.checkbox("🧠 Optimize memory (downcast numeric and repeated text columns)",
+                                   value=True, key="shrink_dtypes")
+            if optimize:
+                df_any = shrink_dtypes(df_any, (uploaded.name, uploaded.size))
+
+            mem_mb, describe_df = frame_overview(df_any, (uploaded.name, uploaded.size, optimize))
+
             # Data overview metrics
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -888,58 +1312,25 @@ elif st.session_state.page == "analyzer":
             with col2:
                 st.metric("Total Columns", len(df_any.columns))
             with col3:
-                st.metric("Memory Usage", f"{df_any.memory_usage(deep=True).sum() / 1024 ** 2:.1f} MB")
+                st.metric("Memory Usage", f"{mem_mb:.1f} MB")
             
             # Data exploration tabs
             preview_tab1, preview_tab2, preview_tab3 = st.tabs(["📋 Data Preview", "🔍 Column Info", "📈 Basic Stats"])
             
             with preview_tab1:
-                st.dataframe(df_any.head(100), use_container_width=True)
+                st.dataframe(preview_head(df_any, (uploaded.name, uploaded.size, optimize)),
+                             use_container_width=True)
                 
             with preview_tab2:
-                col_info = pd.DataFrame({
-                    'Column': df_any.columns,
-                    'Data Type': df_any.dtypes.values,
-                    'Non-Null Count': df_any.notna().sum().values,
-                    'Null Count': df_any.isna().sum().values,
-                    'Unique Values': [df_any[col].nunique() for col in df_any.columns]
-                })
-                st.dataframe(col_info, use_container_width=True)
+                col_info = build_column_info(df_any, (uploaded.name, uploaded.size, optimize))
+                st.dataframe(to_arrow(col_info), use_container_width=True)
                 
             with preview_tab3:
-                st.write(df_any.describe())
+                st.write(describe_df)
             
             st.markdown("---")
             st.markdown("### 🎯 Advanced Analysis")
             
-            # Enhanced column type detection
-            def detect_date_columns(df, sample_size=1000):
-                date_candidates = []
-                for col in df.columns:
-                    # Skip if already datetime
-                    if pd.api.types.is_datetime64_any_dtype(df[col]):
-                        date_candidates.append(col)
-                        continue
-                    
-                    # Sample the data for efficiency
-                    sample_data = df[col].dropna().head(sample_size)
-                    if len(sample_data) == 0:
-                        continue
-                        
-                    # Try to convert to datetime
-                    try:
-                        converted = pd.to_datetime(sample_data, errors='coerce')
-                        # Consider as date column if at least 70% conversion success and has reasonable date range
-                        success_rate = converted.notna().mean()
-                        if success_rate > 0.7:
-                            # Check if dates are reasonable (not all the same or unrealistic)
-                            unique_dates = converted.dropna().nunique()
-                            if unique_dates > 1:  # At least 2 different dates
-                                date_candidates.append(col)
-                    except:
-                        continue
-                return date_candidates
-
             # Data validation function
             def validate_data_for_analysis(df, date_col, value_col):
                 issues = []
@@ -971,8 +1362,8 @@ elif st.session_state.page == "analyzer":
                 
                 return len(issues) == 0, issues
 
-            date_candidates = detect_date_columns(df_any)
-            numeric_candidates = df_any.select_dtypes(include=[np.number]).columns.tolist()
+            date_candidates, numeric_candidates = detect_column_roles(
+                df_any, (uploaded.name, uploaded.size, optimize))
             
             analysis_col1, analysis_col2 = st.columns(2)
             
@@ -998,48 +1389,55 @@ elif st.session_state.page == "analyzer":
                     st.info("💡 Please select different columns or clean your data before analysis.")
                 else:
                     try:
-                        analysis_df = df_any[[date_col, value_col]].copy()
-                        analysis_df[date_col] = pd.to_datetime(analysis_df[date_col], errors='coerce')
-                        analysis_df = analysis_df.dropna()
-                        
+                        analysis_df = build_analysis_frame(df_any, (uploaded.name, uploaded.size, optimize),
+                                                           date_col, value_col)
+
                         if not analysis_df.empty:
-                            # Sort by date for proper time series
-                            analysis_df = analysis_df.sort_values(date_col)
-                            
                             st.markdown("#### 📈 Time Series Analysis")
-                            
-                            # Create time series plot with enhancements
-                            fig, ax = plt.subplots(figsize=(12, 6))
-                            ax.plot(analysis_df[date_col], analysis_df[value_col], 
-                                   marker='o', linewidth=2, markersize=4, color='#6366f1', alpha=0.7)
-                            ax.set_title(f"Time Series: {value_col} over Time", color='white', fontsize=14)
-                            ax.set_xlabel(date_col, color='white', fontsize=12)
-                            ax.set_ylabel(value_col, color='white', fontsize=12)
-                            ax.grid(alpha=0.3)
-                            ax.tick_params(colors='white')
-                            plt.xticks(rotation=45)
-                            plt.tight_layout()
-                            st.pyplot(fig)
+
+                            # Big uploads: stride-downsample the plotted frame to
+                            # ~2000 points so the chart payload stays small, and
+                            # only draw per-point markers on small series
+                            chart_df = analysis_df
+                            if len(chart_df) > 2000:
+                                chart_df = chart_df.iloc[::len(chart_df) // 2000]
+
+                            # Time series plot, rendered client-side by Vega
+                            ts_chart = alt.Chart(chart_df).mark_line(
+                                point=len(chart_df) < 500, color='#6366f1', opacity=0.7, strokeWidth=2
+                            ).encode(
+                                x=alt.X(f"{date_col}:T", title=date_col, axis=alt.Axis(labelAngle=-45)),
+                                y=alt.Y(f"{value_col}:Q", title=value_col),
+                                tooltip=[alt.Tooltip(f"{date_col}:T"), alt.Tooltip(f"{value_col}:Q")]
+                            ).properties(title=f"Time Series: {value_col} over Time", height=400)
+                            st.altair_chart(ts_chart, use_container_width=True)
                             
                             st.markdown("#### 📊 Statistical Insights")
-                            insights_col1, insights_col2, insights_col3 = st.columns(3)
-                            
+
                             values = analysis_df[value_col]
-                            
-                            with insights_col1:
-                                st.metric("Mean", f"{values.mean():.2f}")
-                                st.metric("Median", f"{values.median():.2f}")
-                                st.metric("Count", f"{len(values):,}")
-                                
-                            with insights_col2:
-                                st.metric("Std Dev", f"{values.std():.2f}" if len(values) > 1 else "N/A")
-                                st.metric("Variance", f"{values.var():.2f}" if len(values) > 1 else "N/A")
-                                st.metric("Range", f"{values.max() - values.min():.2f}")
-                                
-                            with insights_col3:
-                                st.metric("Min", f"{values.min():.2f}")
-                                st.metric("Max", f"{values.max():.2f}")
-                                st.metric("25th %ile", f"{values.quantile(0.25):.2f}")
+
+                            # One agg pass feeds every statistic instead of a
+                            # separate full-column scan per statistic, and one
+                            # dataframe replaces nine st.metric components so
+                            # the panel ships as a single frontend message
+                            vstats = values.agg(["mean", "median", "std", "var", "min", "max"])
+                            has_spread = len(values) > 1
+                            stats_df = pd.DataFrame({
+                                "Statistic": ["Mean", "Median", "Count", "Std Dev", "Variance",
+                                              "Range", "Min", "Max", "25th %ile"],
+                                "Value": [
+                                    f"{vstats['mean']:.2f}",
+                                    f"{vstats['median']:.2f}",
+                                    f"{len(values):,}",
+                                    f"{vstats['std']:.2f}" if has_spread else "N/A",
+                                    f"{vstats['var']:.2f}" if has_spread else "N/A",
+                                    f"{vstats['max'] - vstats['min']:.2f}",
+                                    f"{vstats['min']:.2f}",
+                                    f"{vstats['max']:.2f}",
+                                    f"{values.quantile(0.25):.2f}",
+                                ],
+                            })
+                            st.dataframe(stats_df, hide_index=True, use_container_width=True)
                             
                             # Additional insights
                             if len(analysis_df) > 1:
@@ -1067,7 +1465,7 @@ elif st.session_state.page == "analyzer":
             
             st.markdown("---")
             st.markdown("### 💾 Export Results")
-            processed_csv = df_any.to_csv(index=False).encode('utf-8')
+            processed_csv = export_any_csv(df_any, (uploaded.name, uploaded.size, optimize))
             st.download_button("📥 Download Processed Data", processed_csv, 
                              "fourcast_analysis.csv", "text/csv", use_container_width=True)
                 
@@ -1075,15 +1473,7 @@ elif st.session_state.page == "analyzer":
             st.error(f"❌ Failed to process CSV: {e}")
     else:
         # Empty state for analyzer page
-        st.markdown("""
-        <div style='text-align: center; padding: 60px; background: rgba(255,255,255,0.03); border-radius: 12px;'>
-            <h3 style='color: #cbd5e1; margin-bottom: 20px;'>📂 Upload Your Data</h3>
-            <p style='color: #94a3b8; margin-bottom: 30px;'>
-                Drag and drop any CSV file to unlock powerful analysis features including:<br>
-                • Automatic column detection • Time series analysis • Statistical insights • Data visualization
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(ANALYZER_EMPTY_STATE_HTML, unsafe_allow_html=True)
 
 # =============================================================================
 # FOOTER
@@ -1096,4 +1486,11 @@ with footer_col1:
 with footer_col2:
     st.caption("💾 Auto-save enabled")
 with footer_col3:
-    st.caption("🔒 Privacy first")
\ No newline at end of file
+    st.caption("🔒 Privacy first")
+# Flush any save that was debounced earlier in this run so dirty records
+# never outlive the script run that mutated them
+if st.session_state.get("_dirty"):
+    try:
+        _flush_data()
+    except Exception:
+        pass